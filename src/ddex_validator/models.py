@@ -1,10 +1,48 @@
 """驗證結果模型"""
 
 from typing import List, Optional, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
+from itertools import chain
 import json
+import sys
 from datetime import datetime
+from collections import Counter
+
+try:
+    import orjson
+except ImportError:  # orjson 為選用依賴，未安裝時使用標準庫 json
+    orjson = None
+
+
+# 驗證失敗時附加的修正建議摘要
+_FIX_SUGGESTIONS = (
+    "\n💡 修正建議:\n"
+    + "-" * 40 + "\n"
+    "1. 請根據上述錯誤訊息逐一修正XML內容\n"
+    "2. 參考DDEX官方文檔確認元素格式\n"
+    "3. 使用XML編輯器檢查語法錯誤\n"
+    "4. 確認所有必要元素都已包含"
+)
+
+
+def _slotted(cls=None, *, extra_slots=()):
+    """為 dataclass 加上 __slots__，移除每個實例的 __dict__（相容 Python 3.10 之前的版本）
+
+    extra_slots 為不屬於 dataclass 欄位的額外 slot（例如內部快取）；
+    另保留 __weakref__ slot，實例仍可被弱參照。
+    """
+    def wrap(cls):
+        field_names = tuple(f.name for f in fields(cls))
+        cls_dict = dict(cls.__dict__)
+        cls_dict["__slots__"] = field_names + tuple(extra_slots) + ("__weakref__",)
+        for name in field_names:
+            cls_dict.pop(name, None)
+        cls_dict.pop("__dict__", None)
+        cls_dict.pop("__weakref__", None)
+        return type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    
+    return wrap if cls is None else wrap(cls)
 
 
 class SeverityLevel(Enum):
@@ -14,6 +52,15 @@ class SeverityLevel(Enum):
     INFO = "INFO"
 
 
+# 嚴重程度對應到 ValidationResult 的問題列表屬性
+_SEVERITY_ATTRS = {
+    SeverityLevel.ERROR: "errors",
+    SeverityLevel.WARNING: "warnings",
+    SeverityLevel.INFO: "info",
+}
+
+
+@_slotted(extra_slots=("_cached_dict",))
 @dataclass
 class ValidationIssue:
     """驗證問題"""
@@ -26,38 +73,48 @@ class ValidationIssue:
     context: Optional[str] = None
     suggestion: Optional[str] = None
     
+    def __post_init__(self):
+        self._cached_dict = None
+    
+    def __getstate__(self):
+        """複製或序列化時只保留欄位值，不帶入 to_dict 快取"""
+        return tuple(getattr(self, f.name) for f in fields(self))
+    
+    def __setstate__(self, state):
+        for f, value in zip(fields(self), state):
+            setattr(self, f.name, value)
+        self._cached_dict = None
+    
     def __str__(self) -> str:
         """格式化輸出驗證問題"""
-        parts = []
-        
         # 嚴重程度和錯誤代碼
-        severity_part = f"[{self.severity.value}"
-        if self.error_code:
-            severity_part += f":{self.error_code}"
-        severity_part += "]"
-        parts.append(severity_part)
+        code = f":{self.error_code}" if self.error_code else ""
         
         # 位置資訊
         if self.line_number and self.column_number:
-            parts.append(f"行 {self.line_number}, 列 {self.column_number}")
+            location = f" 行 {self.line_number}, 列 {self.column_number}"
         elif self.element_path:
-            parts.append(f"元素: {self.element_path}")
+            location = f" 元素: {self.element_path}"
+        else:
+            location = ""
         
-        # 組合基本資訊
-        basic_info = " ".join(parts) + f": {self.message}"
+        # 上下文和建議
+        context = f"\n    上下文: {self.context}" if self.context else ""
+        suggestion = f"\n    建議: {self.suggestion}" if self.suggestion else ""
         
-        # 添加上下文和建議
-        full_message = basic_info
-        if self.context:
-            full_message += f"\n    上下文: {self.context}"
-        if self.suggestion:
-            full_message += f"\n    建議: {self.suggestion}"
-            
-        return full_message
+        return f"[{self.severity.value}{code}]{location}: {self.message}{context}{suggestion}"
     
-    def to_dict(self) -> Dict[str, Any]:
-        """轉換為字典格式，便於JSON輸出"""
-        return {
+    def to_dict(self, use_cache: bool = False) -> Dict[str, Any]:
+        """轉換為字典格式，便於JSON輸出
+
+        use_cache 為 True 時重用第一次建立的字典，僅適用於不再修改的問題；
+        快取的字典為共用物件，請勿修改。
+        """
+        if use_cache:
+            cached = self._cached_dict
+            if cached is not None:
+                return cached
+        data = {
             "severity": self.severity.value,
             "message": self.message,
             "line_number": self.line_number,
@@ -67,8 +124,24 @@ class ValidationIssue:
             "context": self.context,
             "suggestion": self.suggestion
         }
+        if use_cache:
+            self._cached_dict = data
+        return data
+
+
+def _encode_issue(obj: Any, use_cache: bool = False) -> Dict[str, Any]:
+    """JSON 編碼器的 default 回呼：將 ValidationIssue 轉換為字典"""
+    if isinstance(obj, ValidationIssue):
+        return obj.to_dict(use_cache=use_cache)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 
+def _encode_issue_cached(obj: Any) -> Dict[str, Any]:
+    """同 _encode_issue，但重用各問題快取的字典"""
+    return _encode_issue(obj, use_cache=True)
 
+
+@_slotted
 @dataclass
 class ValidationResult:
     """驗證結果"""
@@ -85,17 +158,17 @@ class ValidationResult:
     @property
     def has_errors(self) -> bool:
         """是否有錯誤"""
-        return len(self.errors) > 0
+        return bool(self.errors)
     
     @property
     def has_warnings(self) -> bool:
         """是否有警告"""
-        return len(self.warnings) > 0
+        return bool(self.warnings)
     
     @property
     def has_info(self) -> bool:
         """是否有資訊"""
-        return len(self.info) > 0
+        return bool(self.info)
     
     @property
     def total_issues(self) -> int:
@@ -119,81 +192,90 @@ class ValidationResult:
     
     def get_issues_by_severity(self, severity: SeverityLevel) -> List[ValidationIssue]:
         """根據嚴重程度取得問題列表"""
-        if severity == SeverityLevel.ERROR:
-            return self.errors
-        elif severity == SeverityLevel.WARNING:
-            return self.warnings
-        elif severity == SeverityLevel.INFO:
-            return self.info
-        return []
+        attr = _SEVERITY_ATTRS.get(severity)
+        return getattr(self, attr) if attr else []
     
     def get_issues_by_error_code(self, error_code: str) -> List[ValidationIssue]:
         """根據錯誤代碼取得問題列表"""
-        all_issues = self.errors + self.warnings + self.info
-        return [issue for issue in all_issues if issue.error_code == error_code]
+        return [issue for issue in chain(self.errors, self.warnings, self.info)
+                if issue.error_code == error_code]
     
-    def to_json(self, indent: int = 2) -> str:
-        """轉換為JSON格式"""
+    def to_json(self, indent: int = 2, cache: bool = False) -> str:
+        """轉換為JSON格式
+
+        indent 為 2（預設）且已安裝 orjson 時使用 orjson 序列化，
+        其他 indent 值使用標準庫 json；兩者輸出格式相同。
+        cache 為 True 時重用各問題快取的字典，適合重複輸出同一份不再修改的結果。
+        """
+        # 問題列表直接交給編碼器，由 default 回呼逐一轉換，不預先建立字典列表
+        default = _encode_issue_cached if cache else _encode_issue
         data = {
             "summary": self.get_summary(),
-            "errors": [error.to_dict() for error in self.errors],
-            "warnings": [warning.to_dict() for warning in self.warnings],
-            "info": [info.to_dict() for info in self.info]
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "info": self.info
         }
-        return json.dumps(data, ensure_ascii=False, indent=indent)
+        if orjson is not None and indent == 2:
+            # orjson 預設會自行序列化 dataclass，需略過才能交由 _encode_issue 處理
+            option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_INDENT_2
+            return orjson.dumps(data, default=default, option=option).decode("utf-8")
+        return json.dumps(data, default=default, ensure_ascii=False, indent=indent)
     
     def print_summary(self, show_details: bool = True, show_warnings: bool = True):
         """列印驗證摘要"""
-        print(f"\n{'='*60}")
-        print(f"DDEX XML 驗證結果")
-        print(f"{'='*60}")
-        print(f"狀態: {'✅ 通過' if self.is_valid else '❌ 失敗'}")
+        errors_count = len(self.errors)
+        warnings_count = len(self.warnings)
+        info_count = len(self.info)
+        
+        lines = [
+            "",
+            "=" * 60,
+            "DDEX XML 驗證結果",
+            "=" * 60,
+            f"狀態: {'✅ 通過' if self.is_valid else '❌ 失敗'}",
+        ]
         
         if self.file_path:
-            print(f"檔案: {self.file_path}")
+            lines.append(f"檔案: {self.file_path}")
         if self.file_size:
-            print(f"檔案大小: {self.file_size:,} bytes")
+            lines.append(f"檔案大小: {self.file_size:,} bytes")
         
-        print(f"訊息類型: {self.message_type or '未知'}")
-        print(f"DDEX版本: {self.ddex_version or '未知'}")
-        print(f"錯誤: {len(self.errors)}")
-        print(f"警告: {len(self.warnings)}")
-        print(f"資訊: {len(self.info)}")
+        lines.append(f"訊息類型: {self.message_type or '未知'}")
+        lines.append(f"DDEX版本: {self.ddex_version or '未知'}")
+        lines.append(f"錯誤: {errors_count}")
+        lines.append(f"警告: {warnings_count}")
+        lines.append(f"資訊: {info_count}")
         
         if self.validation_time:
-            print(f"驗證時間: {self.validation_time:.3f}秒")
+            lines.append(f"驗證時間: {self.validation_time:.3f}秒")
         
-        print(f"{'='*60}")
+        lines.append("=" * 60)
         
         # 顯示錯誤詳情
         if show_details and self.errors:
-            print(f"\n🔴 錯誤詳情 ({len(self.errors)}):")
-            print("-" * 40)
-            for i, error in enumerate(self.errors, 1):
-                print(f"\n{i}. {error}")
+            lines.append(f"\n🔴 錯誤詳情 ({errors_count}):")
+            lines.append("-" * 40)
+            lines.extend(f"\n{i}. {error}" for i, error in enumerate(self.errors, 1))
         
         # 顯示警告詳情
         if show_details and show_warnings and self.warnings:
-            print(f"\n🟡 警告詳情 ({len(self.warnings)}):")
-            print("-" * 40)
-            for i, warning in enumerate(self.warnings, 1):
-                print(f"\n{i}. {warning}")
+            lines.append(f"\n🟡 警告詳情 ({warnings_count}):")
+            lines.append("-" * 40)
+            lines.extend(f"\n{i}. {warning}" for i, warning in enumerate(self.warnings, 1))
         
         # 顯示資訊
         if show_details and self.info:
-            print(f"\n🔵 資訊 ({len(self.info)}):")
-            print("-" * 40)
-            for i, info in enumerate(self.info, 1):
-                print(f"\n{i}. {info}")
+            lines.append(f"\n🔵 資訊 ({info_count}):")
+            lines.append("-" * 40)
+            lines.extend(f"\n{i}. {info}" for i, info in enumerate(self.info, 1))
         
         # 顯示修正建議摘要
         if self.errors:
-            print(f"\n💡 修正建議:")
-            print("-" * 40)
-            print("1. 請根據上述錯誤訊息逐一修正XML內容")
-            print("2. 參考DDEX官方文檔確認元素格式")
-            print("3. 使用XML編輯器檢查語法錯誤")
-            print("4. 確認所有必要元素都已包含")
+            lines.append(_FIX_SUGGESTIONS)
+        
+        # 一次寫出，避免逐行 print 的 I/O 開銷
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
     
     @classmethod
     def success(cls, message_type: str = None, ddex_version: str = None, 
@@ -225,6 +307,7 @@ class ValidationResult:
         )
 
 
+@_slotted
 @dataclass
 class DDEXMessage:
     """DDEX訊息資訊"""
@@ -258,9 +341,9 @@ class ValidationStatistics:
         self.invalid_files = 0
         self.total_errors = 0
         self.total_warnings = 0
-        self.error_codes: Dict[str, int] = {}
-        self.message_types: Dict[str, int] = {}
-        self.ddex_versions: Dict[str, int] = {}
+        self.error_codes: Counter = Counter()
+        self.message_types: Counter = Counter()
+        self.ddex_versions: Counter = Counter()
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
     
@@ -277,17 +360,15 @@ class ValidationStatistics:
         self.total_warnings += len(result.warnings)
         
         # 統計錯誤代碼
-        for error in result.errors:
-            if error.error_code:
-                self.error_codes[error.error_code] = self.error_codes.get(error.error_code, 0) + 1
+        self.error_codes.update(error.error_code for error in result.errors if error.error_code)
         
         # 統計訊息類型
         if result.message_type:
-            self.message_types[result.message_type] = self.message_types.get(result.message_type, 0) + 1
+            self.message_types[result.message_type] += 1
         
         # 統計DDEX版本
         if result.ddex_version:
-            self.ddex_versions[result.ddex_version] = self.ddex_versions.get(result.ddex_version, 0) + 1
+            self.ddex_versions[result.ddex_version] += 1
     
     def start_timing(self):
         """開始計時"""
@@ -321,40 +402,43 @@ class ValidationStatistics:
             "total_errors": self.total_errors,
             "total_warnings": self.total_warnings,
             "total_time": self.total_time,
-            "error_codes": dict(sorted(self.error_codes.items(), key=lambda x: x[1], reverse=True)),
-            "message_types": self.message_types,
-            "ddex_versions": self.ddex_versions
+            "error_codes": dict(self.error_codes.most_common()),
+            "message_types": dict(self.message_types),
+            "ddex_versions": dict(self.ddex_versions)
         }
     
     def print_summary(self):
         """列印統計摘要"""
-        print(f"\n{'='*60}")
-        print(f"驗證統計摘要")
-        print(f"{'='*60}")
-        print(f"總檔案數: {self.total_files}")
-        print(f"有效檔案: {self.valid_files}")
-        print(f"無效檔案: {self.invalid_files}")
-        print(f"成功率: {self.success_rate:.1f}%")
-        print(f"總錯誤數: {self.total_errors}")
-        print(f"總警告數: {self.total_warnings}")
+        lines = [
+            "",
+            "=" * 60,
+            "驗證統計摘要",
+            "=" * 60,
+            f"總檔案數: {self.total_files}",
+            f"有效檔案: {self.valid_files}",
+            f"無效檔案: {self.invalid_files}",
+            f"成功率: {self.success_rate:.1f}%",
+            f"總錯誤數: {self.total_errors}",
+            f"總警告數: {self.total_warnings}",
+        ]
         
-        if self.total_time:
-            print(f"總處理時間: {self.total_time:.2f}秒")
+        total_time = self.total_time
+        if total_time:
+            lines.append(f"總處理時間: {total_time:.2f}秒")
             if self.total_files > 0:
-                print(f"平均處理時間: {self.total_time/self.total_files:.3f}秒/檔案")
+                lines.append(f"平均處理時間: {total_time/self.total_files:.3f}秒/檔案")
         
         if self.error_codes:
-            print(f"\n最常見的錯誤:")
-            for error_code, count in list(self.error_codes.items())[:5]:
-                print(f"  {error_code}: {count}次")
+            lines.append("\n最常見的錯誤:")
+            lines.extend(f"  {error_code}: {count}次" for error_code, count in self.error_codes.most_common(5))
         
         if self.message_types:
-            print(f"\n訊息類型分布:")
-            for msg_type, count in self.message_types.items():
-                print(f"  {msg_type}: {count}個")
+            lines.append("\n訊息類型分布:")
+            lines.extend(f"  {msg_type}: {count}個" for msg_type, count in self.message_types.items())
         
         if self.ddex_versions:
-            print(f"\nDDEX版本分布:")
-            for version, count in self.ddex_versions.items():
-                print(f"  {version}: {count}個")
-
+            lines.append("\nDDEX版本分布:")
+            lines.extend(f"  {version}: {count}個" for version, count in self.ddex_versions.items())
+        
+        lines.append("")
+        sys.stdout.write("\n".join(lines))